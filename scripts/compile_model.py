@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Compiles the served XGBoost model into a native shared library (Treelite + TL2cgen)
+
+The decision forest is turned into generated C code and built with gcc, so the
+serving path can score feature matrices without going through the XGBoost
+runtime. src/serving/inference.py picks the library up automatically when it
+finds <model_dir>/churn.so (or COMPILED_MODEL_LIB), tl2cgen is installed and
+the library reproduces the booster's margins on a probe matrix at startup;
+otherwise it keeps using booster.inplace_predict(). Recompile after every
+model update - a stale library is detected and ignored, not used.
+
+IMPORTANT: The library is platform specific (and *.so is excluded from the
+Docker context), so build it on the machine / inside the image that serves it.
+Requires: pip install treelite tl2cgen, plus a C compiler.
+"""
+
+import os
+import argparse
+import mlflow.sklearn
+import treelite
+import tl2cgen
+
+
+def main(args):
+    """
+    Load the MLflow model, convert its booster to Treelite and export the library.
+
+    """
+    print(f"🔄 Loading model from {args.model_dir}...")
+    booster = mlflow.sklearn.load_model(args.model_dir).get_booster()
+    print(f"✅ Booster loaded: {booster.num_features()} features")
+
+    # === Convert XGBoost booster to Treelite's model representation ===
+    tl_model = treelite.frontend.from_xgboost(booster)
+
+    # === Generate C code and compile it into a shared library ===
+    libpath = args.libpath or os.path.join(args.model_dir, "churn.so")
+    print(f"🛠️  Compiling with {args.toolchain} (parallel_comp={args.parallel_comp})...")
+    tl2cgen.export_lib(
+        tl_model,
+        toolchain=args.toolchain,
+        libpath=libpath,
+        params={"parallel_comp": args.parallel_comp},  # Split generated code for parallel builds
+    )
+    print(f"✅ Compiled model written to {libpath}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Compile the served XGBoost model with Treelite/TL2cgen")
+    p.add_argument("--model_dir", type=str, default="/app/model",
+                   help="MLflow model directory (same as inference.MODEL_DIR)")
+    p.add_argument("--libpath", type=str, default=None,
+                   help="output library path, defaults to <model_dir>/churn.so")
+    p.add_argument("--toolchain", type=str, default="gcc")
+    p.add_argument("--parallel_comp", type=int, default=32)
+
+    args = p.parse_args()
+    main(args)
+
+r"""
+# Use this below to compile the model inside the serving image:
+
+python scripts/compile_model.py --model_dir /app/model
+
+"""
@@ -4,7 +4,6 @@ url = "http://127.0.0.1:8000/predict"
 
 sample_data = {
     "gender": "Male",
-    "SeniorCitizen": 0,
     "Partner": "Yes",
     "Dependents": "No",
     "tenure": 5,
@@ -39,7 +39,7 @@ class CustomerData(BaseModel):
 @app.post("/predict")
 def api_predict(data: CustomerData):
     try:
-        out = predict(data.dict())
+        _, out = predict(data.__dict__)
         return {"prediction": out}
     except Exception as e:
         return {"error": str(e)}
@@ -71,8 +71,8 @@ def gradio_interface(
         "MonthlyCharges": float(MonthlyCharges),
         "TotalCharges": float(TotalCharges),
     }
-    out = predict(payload)
-    return str(out)
+    _, out = predict(payload)
+    return out
 
 demo = gr.Interface(
     fn=gradio_interface,
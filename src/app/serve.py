@@ -0,0 +1,40 @@
+"""
+Production entry point for the FastAPI app: python -m src.app.serve
+
+Kept separate from main.py on purpose: with workers > 1 uvicorn runs this
+module in a supervisor process that only forks the workers, so it must not
+import the app (which would load the model and build the Gradio UI for
+nothing). Each worker imports src.app.main:app itself.
+
+- uvloop + httptools: C-accelerated event loop and HTTP parser
+- access log off: per-request log formatting is measurable at high QPS
+- workers: WEB_CONCURRENCY if set, else the CPUs this process may run on.
+  Each worker loads its own model copy and batcher; under a container CPU
+  quota (cgroup cpu.max) set WEB_CONCURRENCY to the quota explicitly.
+On Linux kernels >= 6.0, io_uring based servers such as granian are a
+drop-in alternative for the same ASGI app.
+"""
+
+import os
+
+import uvicorn
+
+
+def _default_workers() -> int:
+    """CPUs available to this process (respects taskset/cpuset, unlike os.cpu_count())."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # sched_getaffinity is Linux-only
+        return os.cpu_count() or 1
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "src.app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY") or _default_workers()),
+        access_log=False,
+    )